@@ -5,22 +5,28 @@ Uses ContextGem to extract MCP server configuration from documentation
 """
 
 import os
+import re
 import sys
 import json
+import asyncio
+import copy
+import inspect
+import struct
+import hashlib
 import argparse
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+import tempfile
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple, Union, get_args, get_origin
+from functools import lru_cache, wraps
 
-# Configure loguru before importing contextgem to suppress its output
-from loguru import logger
-logger.remove()  # Remove default handler
-logger.add(sys.stderr, level="ERROR")  # Only log errors to stderr
-
-from contextgem import Document, DocumentLLM, StringConcept, JsonObjectConcept
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Simple dictionary-based structure for contextgem
 MCP_CONFIG_STRUCTURE = {
@@ -45,137 +51,832 @@ MCP_CONFIG_STRUCTURE = {
     "url": str
 }
 
+# Model used for extraction; part of the cache key
+OPENAI_MODEL = "gpt-4o-mini"
+LLM_MODEL = f"openai/{OPENAI_MODEL}"
+
+# Bump whenever the concepts/structure or the way results are produced change
+# so stale cache entries are ignored
+SCHEMA_VERSION = "2"
+
+# Keys every extraction result must carry
+RESULT_KEYS = ("extracted_config", "confidence_scores", "source_files")
+
+# Seconds between status checks while a batch job is running
+BATCH_POLL_INTERVAL = 30
+
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Structured-output attempts in fast mode before falling back to the concept path
+FAST_MODE_ATTEMPTS = 2
+
+# Semantic cache: near-duplicate READMEs reuse a prior extraction
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.97
+EMBEDDING_MAX_CHARS = 16000  # Stays well below the embedding model's token limit
+SEMANTIC_INDEX_FILE = "semantic.idx"
+
+# Semantic index layout: magic + embedding dimension, then fixed-size records
+# of (cache key digest, input context digest, float16 unit vector)
+_SEMANTIC_MAGIC = b"MCPSEM1\0"
+_SEMANTIC_HEADER = struct.Struct("<8sI")
+
+# Results kept in the in-process memo before evicting the least recently used
+MEMO_MAX_ENTRIES = 256
+
+# Default number of in-flight extractions when driving a manifest
+DEFAULT_CONCURRENCY = 16
+
+# READMEs above this size are reduced to their setup sections, then truncated
+MAX_README_BYTES = 64 * 1024
+
+# Markdown headings, and the ones worth keeping when a README is oversized
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+_FENCE_RE = re.compile(r'^[ \t]*(`{3,}|~{3,}).*?(?:^[ \t]*\1[ \t]*$|\Z)', re.MULTILINE | re.DOTALL)
+_SETUP_HEADING_RE = re.compile(r'install|config|setup|usage|getting started|environment|quick ?start', re.IGNORECASE)
+
+# Whole-word capability mentions; "logs" must not match inside e.g. "catalog"
+_CAPS_RE = re.compile(r'\b(tools?|resources?|prompts?|logging|logs?)\b', re.IGNORECASE)
+
+# ENV_VAR_NAME style identifiers of at least three characters
+_ENV_RE = re.compile(r'\b[A-Z][A-Z0-9_]{2,}\b')
+
+EXTRACTION_PROMPT = (
+    "You extract MCP (Model Context Protocol) server configuration from documentation. "
+    "Read the README and package.json below and fill in every field of the schema. "
+    "Use an empty string, empty list or false when the documentation does not say."
+)
+
+
+def _structure_to_json_schema(structure: Any) -> Dict[str, Any]:
+    """Convert a contextgem structure definition into a strict JSON schema"""
+    if isinstance(structure, dict):
+        return {
+            "type": "object",
+            "properties": {k: _structure_to_json_schema(v) for k, v in structure.items()},
+            "required": list(structure.keys()),
+            "additionalProperties": False
+        }
+    
+    origin = get_origin(structure)
+    if origin is list:
+        (item_type,) = get_args(structure)
+        return {"type": "array", "items": _structure_to_json_schema(item_type)}
+    if origin is dict:
+        # Strict mode forbids free-form maps, so encode them as name/value pairs
+        _, value_type = get_args(structure)
+        return {
+            "type": "array",
+            "items": _structure_to_json_schema({"name": str, "value": value_type})
+        }
+    if structure is bool:
+        return {"type": "boolean"}
+    if structure is int:
+        return {"type": "integer"}
+    if structure is float:
+        return {"type": "number"}
+    return {"type": "string"}
+
+
+def _decode_structured(value: Any, structure: Any) -> Any:
+    """Undo the name/value pair encoding applied by _structure_to_json_schema"""
+    if isinstance(structure, dict) and isinstance(value, dict):
+        return {k: _decode_structured(value[k], v) for k, v in structure.items() if k in value}
+    if get_origin(structure) is dict and isinstance(value, list):
+        return {item["name"]: item["value"] for item in value
+                if isinstance(item, dict) and "name" in item and "value" in item}
+    return value
+
+
+CONFIG_JSON_SCHEMA = _structure_to_json_schema(MCP_CONFIG_STRUCTURE)
+
+
+def _structure_to_model(name: str, structure: Dict[str, Any]):
+    """Build a pydantic model mirroring a contextgem structure definition"""
+    from pydantic import ConfigDict, create_model
+    
+    fields = {}
+    for key, value in structure.items():
+        if isinstance(value, dict):
+            value = _structure_to_model(f"{name}_{key}", value)
+        fields[key] = (value, ...)
+    return create_model(name, __config__=ConfigDict(extra="forbid", strict=True), **fields)
+
+
+@lru_cache(maxsize=None)
+def _config_model():
+    return _structure_to_model("MCPConfig", MCP_CONFIG_STRUCTURE)
+
+# Extraction concept definitions as (contextgem class name, kwargs); instances
+# hold extracted values, so each document gets fresh ones from _make_concepts()
+_CONCEPT_SPECS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("StringConcept", dict(
+        name="Server Name",
+        description="The name of the MCP server",
+        add_references=True,
+        add_justifications=True
+    )),
+    ("StringConcept", dict(
+        name="Description",
+        description="A brief description of what the server does",
+        add_references=True
+    )),
+    ("StringConcept", dict(
+        name="Installation Command",
+        description="The command to install the server (npm install, pip install, etc)",
+        add_references=True,
+        add_justifications=True
+    )),
+    ("StringConcept", dict(
+        name="Execution Command",
+        description="The command to run the server",
+        add_references=True,
+        add_justifications=True
+    )),
+    ("StringConcept", dict(
+        name="Environment Variables",
+        description="Environment variables required by the server, with descriptions",
+        add_references=True,
+        reference_depth="sentences",
+        add_justifications=True
+    )),
+    ("StringConcept", dict(
+        name="Command Arguments",
+        description="Command line arguments supported by the server",
+        add_references=True,
+        add_justifications=True
+    )),
+    ("StringConcept", dict(
+        name="Capabilities",
+        description="MCP capabilities: tools, resources, prompts, logging",
+        add_references=True
+    )),
+    ("JsonObjectConcept", dict(
+        name="Configuration",
+        description="Complete MCP server configuration",
+        structure=MCP_CONFIG_STRUCTURE,
+        add_references=True,
+        add_justifications=True
+    ))
+)
+
+
+def _make_concepts() -> List[Any]:
+    contextgem = _import_contextgem()
+    return [getattr(contextgem, cls_name)(**kwargs) for cls_name, kwargs in _CONCEPT_SPECS]
+
+
+# Clients are created once and reused so their connection pools stay warm
+_LLM = None
+_OPENAI_CLIENT = None
+_ASYNC_OPENAI_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_CLIENT_LOCK = threading.Lock()
+_SEMANTIC_LOCK = threading.Lock()
+_ENV_LOADED = False
+
+
+def _import_contextgem():
+    """Import contextgem on first use, silencing its loguru output beforehand"""
+    if "contextgem" not in sys.modules:
+        # Configure loguru before importing contextgem to suppress its output
+        from loguru import logger
+        logger.remove()  # Remove default handler
+        logger.add(sys.stderr, level="ERROR")  # Only log errors to stderr
+    
+    import contextgem
+    return contextgem
+
+
+def _get_api_key() -> str:
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        # Load environment variables only once an LLM call is actually needed
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_LOADED = True
+    
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+    return api_key
+
+
+def _get_llm():
+    """Return the shared ContextGem LLM, creating it on first use"""
+    global _LLM
+    if _LLM is None:
+        with _CLIENT_LOCK:
+            if _LLM is None:
+                # Imported here so cache hits and the fast path never load contextgem
+                _LLM = _import_contextgem().DocumentLLM(model=LLM_MODEL, api_key=_get_api_key())
+    return _LLM
+
+
+def _get_openai_client():
+    """Return the shared OpenAI client, creating it on first use"""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _OPENAI_CLIENT is None:
+                from openai import OpenAI
+                _OPENAI_CLIENT = OpenAI(api_key=_get_api_key())
+    return _OPENAI_CLIENT
+
+
+def _get_async_openai_client():
+    """
+    Return the AsyncOpenAI client for the running event loop
+    
+    Its connection pool is bound to the loop it first ran on, so every loop
+    (e.g. each asyncio.run) gets its own client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_OPENAI_CLIENTS.get(loop)
+    if client is None:
+        from openai import AsyncOpenAI
+        client = _ASYNC_OPENAI_CLIENTS[loop] = AsyncOpenAI(api_key=_get_api_key())
+    return client
+
+
+def _json_dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize JSON with orjson when available, matching its output with the stdlib fallback"""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(data, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    return json.dumps(data, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+def _json_loads(text: str) -> Any:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _cache_key(
+    readme_content: str,
+    package_json: Optional[Dict[str, Any]] = None,
+    fast_mode: bool = True
+) -> str:
+    """Content-addressable key for an extraction input and mode"""
+    parts = (
+        readme_content.encode("utf-8"),
+        _json_dumps(package_json, sort_keys=True).encode("utf-8") if package_json else b"",
+    )
+    # Length-prefix each part so different splits never collide
+    payload = b"".join(struct.pack(">Q", len(part)) + part for part in parts)
+    payload += LLM_MODEL.encode("utf-8") + SCHEMA_VERSION.encode("utf-8")
+    payload += b"F" if fast_mode else b"C"
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _load_cached_result(cache_dir: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached extraction result, or None on miss/invalid entry"""
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(path, 'r') as f:
+            entry = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    result = entry.get("result") if isinstance(entry, dict) else None
+    if not isinstance(result, dict) or any(k not in result for k in RESULT_KEYS):
+        return None
+    if entry.get("model") != LLM_MODEL or entry.get("schema_version") != SCHEMA_VERSION:
+        return None
+    return result
+
+
+def _store_cached_result(cache_dir: str, key: str, result: Dict[str, Any]) -> None:
+    """Atomically write an extraction result to the cache"""
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = {
+        "model": LLM_MODEL,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "result": result
+    }
+    _write_atomic(os.path.join(cache_dir, f"{key}.json"), _json_dumps(entry, indent=True))
+
+
+def _embedding_input(readme_content: str) -> str:
+    return _trim_readme(readme_content)[:EMBEDDING_MAX_CHARS]
+
+
+def _to_unit_float16(embedding: List[float]):
+    import numpy as np
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector.astype(np.float16)
+
+
+def _embed(readme_content: str):
+    """Embed a README as a unit-length float16 vector, or None if embedding fails"""
+    from openai import OpenAIError
+    
+    try:
+        response = _get_openai_client().embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=_embedding_input(readme_content)
+        )
+    except OpenAIError:
+        return None
+    return _to_unit_float16(response.data[0].embedding)
+
+
+async def _embed_async(readme_content: str):
+    """Async variant of _embed"""
+    from openai import OpenAIError
+    
+    try:
+        response = await _get_async_openai_client().embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=_embedding_input(readme_content)
+        )
+    except OpenAIError:
+        return None
+    return _to_unit_float16(response.data[0].embedding)
+
+
+def _semantic_context(package_json: Dict[str, Any], fast_mode: bool) -> bytes:
+    """Digest of everything besides the README that a semantic hit must match exactly"""
+    package_bytes = _json_dumps(package_json, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(package_bytes + (b"F" if fast_mode else b"C"), digest_size=16).digest()
+
+
+def _semantic_record_dtype(dim: int):
+    import numpy as np
+    # Raw void fields: "S" fields would strip trailing NUL bytes from digests
+    return np.dtype([("key", "V32"), ("context", "V16"), ("vector", "<f2", (dim,))])
+
+
+def _semantic_lookup(
+    cache_dir: str,
+    embedding,
+    package_json: Dict[str, Any],
+    fast_mode: bool
+) -> Optional[Dict[str, Any]]:
+    """Return the cached result of the most similar README with the same package.json and mode"""
+    import numpy as np
+    
+    path = os.path.join(cache_dir, SEMANTIC_INDEX_FILE)
+    try:
+        with open(path, 'rb') as f:
+            magic, dim = _SEMANTIC_HEADER.unpack(f.read(_SEMANTIC_HEADER.size))
+        size = os.path.getsize(path)
+    except (OSError, struct.error):
+        return None
+    if magic != _SEMANTIC_MAGIC or dim != embedding.shape[0]:
+        return None
+    
+    # A torn trailing record from a concurrent writer is simply not counted
+    record = _semantic_record_dtype(dim)
+    count = (size - _SEMANTIC_HEADER.size) // record.itemsize
+    if count <= 0:
+        return None
+    index = np.memmap(path, dtype=record, mode="r", offset=_SEMANTIC_HEADER.size, shape=(count,))
+    
+    candidates = np.flatnonzero(index["context"] == np.void(_semantic_context(package_json, fast_mode)))
+    if not candidates.size:
+        return None
+    
+    # Rows are unit vectors, so the dot product is the cosine similarity
+    scores = index["vector"][candidates] @ embedding
+    best = int(np.argmax(scores))
+    if float(scores[best]) <= SEMANTIC_CACHE_THRESHOLD:
+        return None
+    return _load_cached_result(cache_dir, index["key"][candidates[best]].tobytes().hex())
+
+
+def _semantic_store(
+    cache_dir: str,
+    key: str,
+    embedding,
+    package_json: Dict[str, Any],
+    fast_mode: bool
+) -> None:
+    """Append one record to the semantic index under an exclusive file lock"""
+    import numpy as np
+    
+    try:
+        import fcntl
+    except ImportError:  # Windows: rely on the in-process lock only
+        fcntl = None
+    
+    dim = embedding.shape[0]
+    record = _semantic_record_dtype(dim)
+    row = np.array([(bytes.fromhex(key), _semantic_context(package_json, fast_mode), embedding)], dtype=record)
+    
+    path = os.path.join(cache_dir, SEMANTIC_INDEX_FILE)
+    with _SEMANTIC_LOCK, open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Released when the file closes
+        
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            f.write(_SEMANTIC_HEADER.pack(_SEMANTIC_MAGIC, dim))
+        else:
+            f.seek(0)
+            magic, stored_dim = _SEMANTIC_HEADER.unpack(f.read(_SEMANTIC_HEADER.size))
+            if magic != _SEMANTIC_MAGIC or stored_dim != dim:
+                return
+            # Drop a torn record left by a crashed writer so rows stay aligned
+            body = size - _SEMANTIC_HEADER.size
+            if body % record.itemsize:
+                f.truncate(_SEMANTIC_HEADER.size + body - body % record.itemsize)
+        
+        f.write(row.tobytes())
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# os.umask can only be read by setting it, which is process-wide; do it once
+# at import time, before any worker threads exist
+_UMASK = _read_umask()
+
+
+def _write_atomic(path: str, data: Union[str, bytes]) -> None:
+    """Write a file via a temporary sibling so readers never see partial output"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        # mkstemp creates files as 0600; use the permissions a plain open() would
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+_MEMO: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+_MEMO_INFLIGHT: Dict[bytes, "asyncio.Future[Dict[str, Any]]"] = {}
+
 
-def extract_configuration(readme_content: str, package_json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def _memo_key(readme_content: str, package_json: Optional[Dict[str, Any]], fast_mode: bool) -> bytes:
+    key = hashlib.blake2b(readme_content.encode("utf-8"), digest_size=16).digest()
+    if package_json:
+        key += hashlib.blake2b(_json_dumps(package_json, sort_keys=True).encode("utf-8"), digest_size=16).digest()
+    return key + (b"F" if fast_mode else b"C")
+
+
+def _memo_get(key: bytes) -> Optional[Dict[str, Any]]:
+    with _MEMO_LOCK:
+        result = _MEMO.get(key)
+        if result is None:
+            return None
+        _MEMO.move_to_end(key)
+    return copy.deepcopy(result)
+
+
+def _memo_put(key: bytes, result: Dict[str, Any]) -> None:
+    result = copy.deepcopy(result)
+    with _MEMO_LOCK:
+        _MEMO[key] = result
+        _MEMO.move_to_end(key)
+        while len(_MEMO) > MEMO_MAX_ENTRIES:
+            _MEMO.popitem(last=False)
+
+
+def _content_memoize(func):
+    """
+    Memoize an extraction function in-process by the hash of its inputs
+    
+    The memo sits in front of the disk and semantic caches: a hit still writes
+    the disk cache entry when cache_dir is given, but does not add to the
+    semantic index. Works for both plain and async functions; concurrent async
+    calls for the same input share one in-flight extraction. Results are
+    deep-copied in and out so callers mutating them cannot affect later hits.
+    """
+    signature = inspect.signature(func)
+    
+    def bind(args, kwargs) -> Dict[str, Any]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return bound.arguments
+    
+    def memo_hit(key: bytes, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        result = _memo_get(key)
+        cache_dir = params["cache_dir"]
+        if result is not None and cache_dir:
+            disk_key = _cache_key(params["readme_content"], params["package_json"], params["fast_mode"])
+            if not os.path.exists(os.path.join(cache_dir, f"{disk_key}.json")):
+                _store_cached_result(cache_dir, disk_key, result)
+        return result
+    
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            params = bind(args, kwargs)
+            key = _memo_key(params["readme_content"], params["package_json"], params["fast_mode"])
+            cached = memo_hit(key, params)
+            if cached is not None:
+                return cached
+            
+            task = _MEMO_INFLIGHT.get(key)
+            if task is None:
+                async def run() -> Dict[str, Any]:
+                    result = await func(*args, **kwargs)
+                    _memo_put(key, result)
+                    return result
+                
+                task = _MEMO_INFLIGHT[key] = asyncio.ensure_future(run())
+                task.add_done_callback(lambda _: _MEMO_INFLIGHT.pop(key, None))
+            # Shielded so one caller being cancelled does not cancel the others
+            return copy.deepcopy(await asyncio.shield(task))
+        return async_wrapper
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        params = bind(args, kwargs)
+        key = _memo_key(params["readme_content"], params["package_json"], params["fast_mode"])
+        cached = memo_hit(key, params)
+        if cached is not None:
+            return cached
+        result = func(*args, **kwargs)
+        _memo_put(key, result)
+        return result
+    return wrapper
+
+
+@_content_memoize
+def extract_configuration(
+    readme_content: str,
+    package_json: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    fast_mode: bool = True,
+    package_json_raw: Optional[str] = None,
+    semantic_cache: bool = False
+) -> Dict[str, Any]:
     """
     Extract MCP server configuration from README and package.json
     
     Args:
         readme_content: README.md content
         package_json: Parsed package.json content (optional)
+        cache_dir: Directory for the content-addressable result cache (optional)
+        fast_mode: Try a single schema-enforced completion before the multi-concept extraction
+        package_json_raw: Original package.json text, sent as-is instead of re-serializing (optional)
+        semantic_cache: Also reuse results for near-duplicate READMEs in cache_dir (optional)
         
     Returns:
         Extracted configuration with confidence scores
     """
-    # Combine sources
-    combined_text = readme_content
-    if package_json:
-        combined_text += f"\n\n---\nPackage.json:\n{json.dumps(package_json, indent=2)}"
+    steps = _extraction_steps(readme_content, package_json, cache_dir, fast_mode, package_json_raw, semantic_cache)
+    return _run_steps(steps)
+
+
+@_content_memoize
+async def extract_configuration_async(
+    readme_content: str,
+    package_json: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    fast_mode: bool = True,
+    package_json_raw: Optional[str] = None,
+    semantic_cache: bool = False
+) -> Dict[str, Any]:
+    """Async variant of extract_configuration sharing the module-level clients"""
+    steps = _extraction_steps(readme_content, package_json, cache_dir, fast_mode, package_json_raw, semantic_cache)
+    return await _run_steps_async(steps)
+
+
+def _extraction_steps(
+    readme_content: str,
+    package_json: Optional[Dict[str, Any]],
+    cache_dir: Optional[str],
+    fast_mode: bool,
+    package_json_raw: Optional[str],
+    semantic_cache: bool
+):
+    """
+    Extraction pipeline shared by the sync and async entry points
     
-    # Create document
-    doc = Document(raw_text=combined_text)
+    Yields (operation, *args) tuples for every network call and receives
+    their results, so the two entry points differ only in how they run them
+    (see _SYNC_STEPS / _ASYNC_STEPS). Returns the extraction result.
+    """
+    # Skip the LLM entirely if this exact input was already extracted
+    key = None
+    if cache_dir:
+        key = _cache_key(readme_content, package_json, fast_mode)
+        cached = _load_cached_result(cache_dir, key)
+        if cached is not None:
+            return cached
     
-    # Define extraction concepts
-    doc.concepts = [
-        StringConcept(
-            name="Server Name",
-            description="The name of the MCP server",
-            add_references=True,
-            add_justifications=True
-        ),
-        StringConcept(
-            name="Description",
-            description="A brief description of what the server does",
-            add_references=True
-        ),
-        StringConcept(
-            name="Installation Command",
-            description="The command to install the server (npm install, pip install, etc)",
-            add_references=True,
-            add_justifications=True
-        ),
-        StringConcept(
-            name="Execution Command",
-            description="The command to run the server",
-            add_references=True,
-            add_justifications=True
-        ),
-        StringConcept(
-            name="Environment Variables",
-            description="Environment variables required by the server, with descriptions",
-            add_references=True,
-            reference_depth="sentences",
-            add_justifications=True
-        ),
-        StringConcept(
-            name="Command Arguments",
-            description="Command line arguments supported by the server",
-            add_references=True,
-            add_justifications=True
-        ),
-        StringConcept(
-            name="Capabilities",
-            description="MCP capabilities: tools, resources, prompts, logging",
-            add_references=True
-        ),
-        JsonObjectConcept(
-            name="Configuration",
-            description="Complete MCP server configuration",
-            structure=MCP_CONFIG_STRUCTURE,
-            add_references=True,
-            add_justifications=True
-        )
-    ]
+    embedding = None
+    # Without a package.json nothing but the README identifies the server, and
+    # READMEs built from a shared template would match each other; a failed
+    # embedding also just skips the semantic layer
+    if key and semantic_cache and package_json:
+        embedding = yield "embed", readme_content
+        cached = None
+        if embedding is not None:
+            cached = _semantic_lookup(cache_dir, embedding, package_json, fast_mode)
+        if cached is not None:
+            _store_cached_result(cache_dir, key, cached)
+            return cached
     
-    # Initialize LLM
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable not set")
+    source_text = _build_source_text(readme_content, package_json, package_json_raw)
     
-    llm = DocumentLLM(
-        model="openai/gpt-4o-mini",
-        api_key=api_key
-    )
+    extracted = None
+    if fast_mode:
+        extracted = yield from _structured_steps(source_text)
     
-    # Extract concepts
-    doc = llm.extract_all(doc)
+    if extracted is not None:
+        config = _build_result(extracted, 0.8, package_json)
+    else:
+        config = yield "concepts", source_text, package_json
     
-    # Build configuration from extracted concepts
-    config = {
-        "extracted_config": {},
-        "confidence_scores": {},
-        "source_files": ["README.md"]
+    if key:
+        _store_cached_result(cache_dir, key, config)
+        if embedding is not None:
+            _semantic_store(cache_dir, key, embedding, package_json, fast_mode)
+    
+    return config
+
+
+def _structured_steps(source_text: str):
+    """
+    Extract the configuration with one schema-enforced completion
+    
+    Validation errors are fed back to the model as a follow-up turn; returns
+    None when every attempt fails or the API errors so the caller can fall back.
+    """
+    request = _chat_request_body(source_text)
+    
+    for attempt in range(FAST_MODE_ATTEMPTS):
+        if attempt:
+            yield "sleep", attempt  # 1s, 2s, ... between attempts
+        
+        content = yield "complete", request
+        if content is None:
+            # Refused or failed; retrying the same prompt will not help
+            return None
+        
+        try:
+            return _validate_structured(content)
+        except ValueError as e:
+            request["messages"].extend(_feedback_messages(content, e))
+    
+    return None
+
+
+def _complete(request: Dict[str, Any]) -> Optional[str]:
+    """Run a chat completion, returning None on refusal or API error"""
+    from openai import OpenAIError
+    
+    try:
+        response = _get_openai_client().chat.completions.create(**request)
+    except OpenAIError:
+        return None
+    return response.choices[0].message.content
+
+
+async def _complete_async(request: Dict[str, Any]) -> Optional[str]:
+    """Async variant of _complete"""
+    from openai import OpenAIError
+    
+    try:
+        response = await _get_async_openai_client().chat.completions.create(**request)
+    except OpenAIError:
+        return None
+    return response.choices[0].message.content
+
+
+async def _extract_concepts_async(source_text: str, package_json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # ContextGem only offers a blocking API; keep it off the event loop
+    return await asyncio.to_thread(_extract_concepts, source_text, package_json)
+
+
+_SYNC_STEPS = {
+    "embed": lambda readme_content: _embed(readme_content),
+    "complete": lambda request: _complete(request),
+    "sleep": time.sleep,
+    "concepts": lambda source_text, package_json: _extract_concepts(source_text, package_json)
+}
+
+_ASYNC_STEPS = {
+    "embed": lambda readme_content: _embed_async(readme_content),
+    "complete": lambda request: _complete_async(request),
+    "sleep": asyncio.sleep,
+    "concepts": lambda source_text, package_json: _extract_concepts_async(source_text, package_json)
+}
+
+
+def _run_steps(steps) -> Any:
+    """Drive an extraction pipeline, performing its I/O synchronously"""
+    result = None
+    while True:
+        try:
+            operation, *args = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = _SYNC_STEPS[operation](*args)
+
+
+async def _run_steps_async(steps) -> Any:
+    """Drive an extraction pipeline, awaiting its I/O"""
+    result = None
+    while True:
+        try:
+            operation, *args = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = await _ASYNC_STEPS[operation](*args)
+
+
+def _feedback_messages(content: str, error: Exception) -> List[Dict[str, str]]:
+    """Conversation turns asking the model to correct an invalid configuration"""
+    return [
+        {"role": "assistant", "content": content},
+        {
+            "role": "user",
+            "content": f"The configuration failed validation:\n{error}\nReturn a corrected configuration."
+        }
+    ]
+
+
+def _validate_structured(content: str) -> Dict[str, Any]:
+    """Decode and validate a structured-output completion, raising ValueError if invalid"""
+    value = _decode_structured(_json_loads(content), MCP_CONFIG_STRUCTURE)
+    return _config_model().model_validate(value).model_dump()
+
+
+def _h_name(extracted: Dict[str, Any], value: str) -> None:
+    extracted["name"] = value
+
+
+def _h_description(extracted: Dict[str, Any], value: str) -> None:
+    extracted["description"] = value
+
+
+def _h_command(extracted: Dict[str, Any], value: str) -> None:
+    # Parse command string
+    parts = value.split()
+    if parts:
+        extracted["command"] = parts[0]
+        if len(parts) > 1:
+            extracted["args"] = parts[1:]
+
+
+def _h_env(extracted: Dict[str, Any], value: str) -> None:
+    extracted["env"] = parse_env_variables(value)
+
+
+def _h_capabilities(extracted: Dict[str, Any], value: str) -> None:
+    hits = {m.group(1).lower().rstrip("s") for m in _CAPS_RE.finditer(value)}
+    extracted["capabilities"] = {
+        "tools": "tool" in hits,
+        "resources": "resource" in hits,
+        "prompts": "prompt" in hits,
+        "logging": "logging" in hits or "log" in hits
     }
+
+
+# Fallback mapping from concept name to the handler writing its field(s)
+_FIELD_HANDLERS = {
+    "Server Name": _h_name,
+    "Description": _h_description,
+    "Execution Command": _h_command,
+    "Environment Variables": _h_env,
+    "Capabilities": _h_capabilities
+}
+
+
+def _extract_concepts(source_text: str, package_json: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Extract the configuration as individual ContextGem concepts"""
+    # Create document
+    doc = _import_contextgem().Document(raw_text=source_text)
     
-    if package_json:
-        config["source_files"].append("package.json")
+    # Define extraction concepts
+    doc.concepts = _make_concepts()
+    
+    # Extract concepts
+    doc = _get_llm().extract_all(doc)
+    
+    values = {concept.name: getattr(concept, 'value', None) for concept in doc.concepts}
     
     # Process structured configuration if extracted
-    for concept in doc.concepts:
-        if concept.name == "Configuration" and hasattr(concept, 'value') and concept.value:
-            config["extracted_config"] = concept.value
-            config["confidence_scores"]["overall"] = 0.8  # Base confidence
-            break
+    config = None
+    if values.get("Configuration"):
+        config = _build_result(values["Configuration"], 0.8, package_json)  # Base confidence
     
     # Fall back to individual concepts if structured extraction failed
-    if not config["extracted_config"]:
+    if config is None:
         extracted = {}
         
-        for concept in doc.concepts:
-            if concept.name == "Server Name" and hasattr(concept, 'value') and concept.value:
-                extracted["name"] = concept.value
-            elif concept.name == "Description" and hasattr(concept, 'value') and concept.value:
-                extracted["description"] = concept.value
-            elif concept.name == "Execution Command" and hasattr(concept, 'value') and concept.value:
-                command_str = concept.value
-                # Parse command string
-                parts = command_str.split()
-                if parts:
-                    extracted["command"] = parts[0]
-                    if len(parts) > 1:
-                        extracted["args"] = parts[1:]
-            elif concept.name == "Environment Variables" and hasattr(concept, 'value') and concept.value:
-                # Parse environment variables
-                env_text = concept.value
-                extracted["env"] = parse_env_variables(env_text)
-            elif concept.name == "Capabilities" and hasattr(concept, 'value') and concept.value:
-                cap_text = concept.value.lower()
-                extracted["capabilities"] = {
-                    "tools": "tool" in cap_text,
-                    "resources": "resource" in cap_text,
-                    "prompts": "prompt" in cap_text,
-                    "logging": "logging" in cap_text or "log" in cap_text
-                }
+        for name, handler in _FIELD_HANDLERS.items():
+            value = values.get(name)
+            if value:
+                handler(extracted, value)
         
         # Add package.json data if available
         if package_json:
@@ -188,67 +889,446 @@ def extract_configuration(readme_content: str, package_json: Optional[Dict[str,
                 if bin_commands and "command" not in extracted:
                     extracted["command"] = bin_commands[0]
         
-        config["extracted_config"] = extracted
-        config["confidence_scores"]["overall"] = 0.6  # Lower confidence for fallback
+        config = _build_result(extracted, 0.6, package_json)  # Lower confidence for fallback
+    
+    return config
+
+
+def _build_source_text(
+    readme_content: str,
+    package_json: Optional[Dict[str, Any]] = None,
+    package_json_raw: Optional[str] = None
+) -> str:
+    """Combine README and package.json into the text sent to the LLM"""
+    combined_text = _trim_readme(readme_content)
+    if package_json_raw is not None:
+        combined_text += f"\n\n---\nPackage.json:\n{package_json_raw}"
+    elif package_json:
+        combined_text += f"\n\n---\nPackage.json:\n{_json_dumps(package_json, indent=True)}"
+    return combined_text
+
+
+def _trim_readme(readme_content: str) -> str:
+    """Keep oversized READMEs within MAX_README_BYTES to bound prompt size"""
+    if len(readme_content.encode("utf-8")) <= MAX_README_BYTES:
+        return readme_content
+    
+    # Prefer the sections that actually describe setup
+    readme_content = _select_setup_sections(readme_content) or readme_content
+    
+    encoded = readme_content.encode("utf-8")
+    if len(encoded) <= MAX_README_BYTES:
+        return readme_content
+    
+    kept = encoded[:MAX_README_BYTES].decode("utf-8", errors="ignore")
+    dropped = len(encoded) - len(kept.encode("utf-8"))
+    return f"{kept}\n[...truncated {dropped} bytes...]"
+
+
+def _select_setup_sections(readme_content: str) -> str:
+    """Return the README preamble plus installation/configuration/usage sections"""
+    # Blank out fenced code (keeping offsets) so shell comments are not taken for headings
+    unfenced = _FENCE_RE.sub(lambda m: re.sub(r'[^\n]', ' ', m.group(0)), readme_content)
+    headings = [(m.start(), len(m.group(1)), m.group(2)) for m in _HEADING_RE.finditer(unfenced)]
+    if not headings:
+        return ""
+    
+    # The intro (up to the first heading below the title) names and describes the server
+    intro_headings = headings[1:] if headings[0][1] == 1 else headings
+    covered_until = intro_headings[0][0] if intro_headings else len(readme_content)
+    parts = [readme_content[:covered_until]]
+    
+    for index, (start, level, title) in enumerate(headings):
+        if start < covered_until or not _SETUP_HEADING_RE.search(title):
+            continue
+        # A section runs until the next heading of the same or a higher level
+        end = next(
+            (other_start for other_start, other_level, _ in headings[index + 1:] if other_level <= level),
+            len(readme_content)
+        )
+        parts.append(readme_content[start:end])
+        covered_until = end
+    
+    if len(parts) == 1:
+        return ""
+    return "".join(parts)
+
+
+def _build_result(
+    extracted_config: Dict[str, Any],
+    overall: float,
+    package_json: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Wrap an extracted configuration with confidence scores and sources"""
+    config = {
+        "extracted_config": extracted_config,
+        "confidence_scores": {"overall": overall},
+        "source_files": ["README.md"]
+    }
+    
+    if package_json:
+        config["source_files"].append("package.json")
     
     # Calculate field-specific confidence scores
     required_fields = ["name", "description", "command"]
-    found_fields = sum(1 for field in required_fields if field in config["extracted_config"])
+    # Structured output always carries every key, so only non-empty values count
+    found_fields = sum(1 for field in required_fields if extracted_config.get(field))
     config["confidence_scores"]["completeness"] = found_fields / len(required_fields)
     
     return config
 
 
-def parse_env_variables(env_text: str) -> Dict[str, Dict[str, Any]]:
-    """Parse environment variables from text"""
-    env_vars = {}
+def _chat_request_body(source_text: str) -> Dict[str, Any]:
+    """Structured-output chat completion request for one server"""
+    return {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {"role": "system", "content": EXTRACTION_PROMPT},
+            {"role": "user", "content": source_text}
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "mcp_server_configuration",
+                "schema": CONFIG_JSON_SCHEMA,
+                "strict": True
+            }
+        }
+    }
+
+
+def extract_batch(
+    entries: List[Dict[str, Any]],
+    cache_dir: Optional[str] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract configurations for many servers with a single OpenAI Batch job
+    
+    Args:
+        entries: Items with "id", "readme_content" and optional "package_json"/"package_json_raw"
+        cache_dir: Directory for the content-addressable result cache (optional)
+        poll_interval: Seconds to wait between batch status checks
+        
+    Returns:
+        Mapping of entry id to extraction result, or to an {"error": ...} dict
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    keys: Dict[str, str] = {}
+    
+    for entry in entries:
+        if cache_dir:
+            # Batch requests are the same structured completion as fast mode
+            keys[entry["id"]] = _cache_key(entry["readme_content"], entry.get("package_json"))
+            cached = _load_cached_result(cache_dir, keys[entry["id"]])
+            if cached is not None:
+                results[entry["id"]] = cached
+                continue
+        pending[entry["id"]] = entry
+    
+    if not pending:
+        return results
     
-    # Simple pattern matching for ENV_VAR_NAME
-    import re
-    pattern = r'([A-Z_]+(?:_[A-Z]+)*)'
-    matches = re.findall(pattern, env_text)
+    client = _get_openai_client()
     
-    for var in matches:
-        env_vars[var] = {
+    # Submit all requests as one JSONL file
+    lines = [
+        _json_dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _chat_request_body(_build_source_text(
+                entry["readme_content"],
+                entry.get("package_json"),
+                entry.get("package_json_raw")
+            ))
+        })
+        for custom_id, entry in pending.items()
+    ]
+    batch_input = client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    
+    # Expired or cancelled batches may still carry partial output worth keeping
+    if not batch.output_file_id and not batch.error_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+    
+    output_lines = []
+    if batch.output_file_id:
+        output_lines += client.files.content(batch.output_file_id).text.splitlines()
+    if batch.error_file_id:
+        output_lines += client.files.content(batch.error_file_id).text.splitlines()
+    
+    for line in output_lines:
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        custom_id = item.get("custom_id")
+        entry = pending.pop(custom_id, None)
+        if entry is None:
+            continue
+        
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            results[custom_id] = {"error": _batch_error_message(item)}
+            continue
+        
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            extracted = _validate_structured(content)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            results[custom_id] = {"error": f"Invalid structured output: {e}"}
+            continue
+        
+        config = _build_result(extracted, 0.8, entry.get("package_json"))
+        if cache_dir:
+            _store_cached_result(cache_dir, keys[custom_id], config)
+        results[custom_id] = config
+    
+    # Anything left was never processed before the batch stopped
+    for custom_id in pending:
+        results[custom_id] = {"error": f"Batch {batch.id} ended with status {batch.status} before this request ran"}
+    
+    return results
+
+
+def _batch_error_message(item: Dict[str, Any]) -> str:
+    """Best available error description for a failed batch output/error line"""
+    body = (item.get("response") or {}).get("body")
+    error = item.get("error") or (body.get("error") if isinstance(body, dict) else None) or body
+    if isinstance(error, dict):
+        return error.get("message") or _json_dumps(error)
+    return str(error or "Unknown batch error")
+
+
+def parse_env_variables(env_text: str) -> Dict[str, Dict[str, Any]]:
+    """Parse environment variables from text"""
+    return {
+        var: {
             "description": f"Environment variable {var}",
             "required": True,
             "example": ""
         }
+        for var in _find_env_names(env_text)
+    }
+
+
+@lru_cache(maxsize=256)
+def _find_env_names(env_text: str) -> Tuple[str, ...]:
+    # Deduplicate while keeping first-seen order; the cached tuple is immutable
+    # so callers can freely mutate the dict built from it
+    return tuple(dict.fromkeys(_ENV_RE.findall(env_text)))
+
+
+def _read_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Read a JSONL manifest of extraction inputs
+    
+    Each line is {"id": ..., "readme": ..., "package_json": ..., "output": ...};
+    only "readme" is required and paths are relative to the manifest file.
+    Ids default to the line index and must be unique.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    entries = []
+    seen_ids = set()
+    
+    with open(manifest_path, 'r') as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            item = _json_loads(line)
+            
+            entry_id = str(item.get("id", index))
+            if entry_id in seen_ids:
+                raise ValueError(f"Duplicate manifest id {entry_id!r} on line {index + 1}")
+            seen_ids.add(entry_id)
+            
+            with open(os.path.join(base_dir, item["readme"]), 'r') as rf:
+                readme_content = rf.read()
+            
+            package_json = package_json_raw = None
+            if item.get("package_json"):
+                with open(os.path.join(base_dir, item["package_json"]), 'r') as pf:
+                    package_json_raw = pf.read()
+                package_json = _json_loads(package_json_raw)
+            
+            entries.append({
+                "id": entry_id,
+                "readme_content": readme_content,
+                "package_json": package_json,
+                "package_json_raw": package_json_raw,
+                "output": os.path.join(base_dir, item["output"]) if item.get("output") else None
+            })
+    
+    return entries
+
+
+def _write_output(path: Optional[str], data: Any) -> None:
+    """Write JSON to a file, or to stdout when no path is given"""
+    output_json = _json_dumps(data, indent=True)
+    
+    if path:
+        _write_atomic(path, output_json)
+    else:
+        print(output_json)
+
+
+async def _drive(
+    entries: List[Dict[str, Any]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache_dir: Optional[str] = None,
+    fast_mode: bool = True,
+    semantic_cache: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """Extract every manifest entry concurrently, bounded by a semaphore"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(entry: Dict[str, Any]) -> Dict[str, Any]:
+        readme_content, package_json = entry["readme_content"], entry.get("package_json")
+        
+        # Exact cache hits resolve without waiting for a slot
+        if cache_dir:
+            cached = _load_cached_result(cache_dir, _cache_key(readme_content, package_json, fast_mode))
+            if cached is not None:
+                return cached
+        
+        try:
+            async with semaphore:
+                return await extract_configuration_async(
+                    readme_content,
+                    package_json,
+                    cache_dir=cache_dir,
+                    fast_mode=fast_mode,
+                    package_json_raw=entry.get("package_json_raw"),
+                    semantic_cache=semantic_cache
+                )
+        except Exception as e:
+            return {"error": str(e)}
+    
+    results = await asyncio.gather(*(run(entry) for entry in entries))
+    return {entry["id"]: result for entry, result in zip(entries, results)}
+
+
+def _write_manifest_results(entries: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]], output: Optional[str]) -> int:
+    """Write per-entry outputs, collect the rest into one document and return the failure count"""
+    collected = {}
+    failed = 0
+    
+    for entry in entries:
+        result = results[entry["id"]]
+        if "error" in result:
+            failed += 1
+            print(f"Error: {entry['id']}: {result['error']}", file=sys.stderr)
+        elif entry["output"]:
+            _write_output(entry["output"], result)
+            continue
+        collected[entry["id"]] = result
+    
+    if collected:
+        _write_output(output, collected)
     
-    return env_vars
+    return failed
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 
 def main():
     parser = argparse.ArgumentParser(description="Extract MCP server configuration using AI")
-    parser.add_argument("--readme", required=True, help="Path to README file")
+    parser.add_argument("--readme", help="Path to README file")
     parser.add_argument("--package-json", help="Path to package.json file")
     parser.add_argument("--output", help="Output file path (default: stdout)")
+    parser.add_argument("--cache-dir", help="Directory for caching extraction results by content hash")
+    parser.add_argument("--manifest", "--inputs", dest="manifest",
+                        help="JSONL file listing README/package.json inputs for bulk extraction")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit manifest inputs as a single OpenAI Batch job (fast mode only; --concurrency does not apply)")
+    parser.add_argument("--no-fast-mode", dest="fast_mode", action="store_false",
+                        help="Skip the schema-enforced single completion and use full concept extraction")
+    parser.add_argument("--concurrency", type=_positive_int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum concurrent extractions for --manifest (default: %(default)s)")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Reuse cached results for near-duplicate READMEs with an identical package.json "
+                             "(requires --cache-dir; inputs without a package.json are never matched)")
     
     args = parser.parse_args()
     
+    if args.batch and not args.manifest:
+        parser.error("--batch requires --manifest")
+    if args.batch and not args.fast_mode:
+        parser.error("--batch cannot be combined with --no-fast-mode")
+    if args.batch and args.semantic_cache:
+        parser.error("--batch cannot be combined with --semantic-cache")
+    if args.semantic_cache and not args.cache_dir:
+        parser.error("--semantic-cache requires --cache-dir")
+    
+    if args.manifest:
+        try:
+            entries = _read_manifest(args.manifest)
+            if args.batch:
+                results = extract_batch(entries, cache_dir=args.cache_dir)
+            else:
+                results = asyncio.run(_drive(
+                    entries,
+                    concurrency=args.concurrency,
+                    cache_dir=args.cache_dir,
+                    fast_mode=args.fast_mode,
+                    semantic_cache=args.semantic_cache
+                ))
+            failed = _write_manifest_results(entries, results, args.output)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if failed:
+            sys.exit(1)
+        return
+    
+    if not args.readme:
+        parser.error("--readme is required unless --manifest is given")
+    
     # Read README
     with open(args.readme, 'r') as f:
         readme_content = f.read()
     
     # Read package.json if provided
-    package_json = None
+    package_json = package_json_raw = None
     if args.package_json:
         with open(args.package_json, 'r') as f:
-            package_json = json.load(f)
+            package_json_raw = f.read()
+        package_json = _json_loads(package_json_raw)
     
     try:
         # Extract configuration
-        result = extract_configuration(readme_content, package_json)
+        result = extract_configuration(
+            readme_content,
+            package_json,
+            cache_dir=args.cache_dir,
+            fast_mode=args.fast_mode,
+            package_json_raw=package_json_raw,
+            semantic_cache=args.semantic_cache
+        )
         
         # Output result
-        output_json = json.dumps(result, indent=2)
+        _write_output(args.output, result)
         
-        if args.output:
-            with open(args.output, 'w') as f:
-                f.write(output_json)
-        else:
-            print(output_json)
-            
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)